@@ -89,6 +89,9 @@ class SanitizedArguments:
             self.partitions_list_children = True
         elif partition_show_physical_disk and self.logical_disk_orientation:
             self.partitions_list_children = True
+        self.physical_disks_only = not (
+            self.list_partitions or self.logical_disk_orientation
+        )
 
     def _add_to_list(self, some_list: list, item: str) -> None:
         if item not in some_list:
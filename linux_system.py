@@ -24,13 +24,18 @@ class LinuxSystem(System):
     privileges.
 
     """
+    __slots__ = ()
 
-    def __init__(self, name: str = None) -> None:
-        super().__init__(name)
+    def __init__(
+        self,
+        name: str = None,
+        physical_disks_only: bool = False
+    ) -> None:
+        super().__init__(name, physical_disks_only)
         self._set_version()
         self['Type'] = 'Linux'
 
-    def _set_version(self):
+    def _set_version(self) -> None:
         """The distribution version of the system.
 
         There is no 'one' way to get version information about a linux distro.
@@ -115,6 +120,8 @@ class LinuxSystem(System):
     def _parse_system(self) -> None:
         block_devices = self._get_block_devices()
         self._physical_disks.extend(self._get_scsi_hard_drives(block_devices))
+        if self._physical_disks_only:
+            return
         # for each_device in block_devices:
         #     # handeling metadisk (raid) devices
         #     if each_device[0] == '9':
@@ -192,6 +199,8 @@ class LinuxSystem(System):
 
 
 class LinuxPhysicalDisk(PhysicalDisk):
+    __slots__ = ('_major_number', '_minor_number')
+
     def __init__(
         self,
         system: SystemComponent,
@@ -216,7 +225,7 @@ class LinuxPhysicalDisk(PhysicalDisk):
         self['Bytes per Sector'] = sector_size
         self['Size'] = sectors * sector_size
 
-    def _set_name_and_path(self, name):
+    def _set_name_and_path(self, name: str) -> None:
         self['Name'] = name
         self['Path'] = f'/dev/{name}'
 
@@ -225,6 +234,8 @@ class LinuxPhysicalDisk(PhysicalDisk):
 
 
 class LinuxPartition(Partition):
+    __slots__ = ('_major_number', '_minor_number')
+
     def __init__(
         self,
         disk: 'PhysicalDisk',
@@ -254,6 +265,8 @@ class LinuxPartition(Partition):
 
 
 class LinuxLogicalDisk(LogicalDisk):
+    __slots__ = ()
+
     def __init__(
         self,
         system: object,
@@ -268,7 +281,7 @@ class LinuxLogicalDisk(LogicalDisk):
         self['Size'] = size
         self['Free Space'] = free_space
 
-    def _set_path_device_id_and_name(self, path):
+    def _set_path_device_id_and_name(self, path: str) -> None:
         self['Path'] = path
         self['Device I.D.'] = path
         self['Name'] = path
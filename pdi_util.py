@@ -157,7 +157,7 @@ class LogicalDiskStringifier(Stringifier):
 def stringify(
     system_component: SystemComponent,
     arguments: SanitizedArguments = None
-):
+) -> str:
     result = None
     if isinstance(system_component, System):
         result = SystemStringifier(system=system_component)
@@ -190,13 +190,26 @@ class LineAssembler:
         if system:
             self.system = system
         else:
-            self.system = create_system(self.arguments.system_name)
+            self.system = create_system(
+                self.arguments.system_name,
+                self.arguments.physical_disks_only
+            )
         self.lines: list[str] = []
+        self._item_strings: dict[int, str] = {}
         self.create_itemlines()
 
+    def _stringify_item(self, item: SystemComponent) -> str:
+        """Return the string for item. A component can show up more than
+        once in a listing, so each one is only stringified the first time."""
+        item_string = self._item_strings.get(id(item))
+        if item_string is None:
+            item_string = stringify(item, self.arguments)
+            self._item_strings[id(item)] = item_string
+        return item_string
+
     def add_item_line(self, item: SystemComponent) -> None:
         self.lines.append(
-            f'{" " * self.indent}{stringify(item, self.arguments)}'
+            f'{" " * self.indent}{self._stringify_item(item)}'
         )
 
     def create_itemlines(self) -> None:
@@ -7,11 +7,20 @@ if sys.platform == 'win32':
     from windows_system import WindowsSystem
 
 
-def create_system(name: str = '') -> System:
+def create_system(name: str = '', physical_disks_only: bool = False) -> System:
+    """Create a System for the host.
+
+    With physical_disks_only, partitions and logical disks are not parsed."""
     if sys.platform == 'win32':
-        return WindowsSystem(name=name)
+        return WindowsSystem(
+            name=name,
+            physical_disks_only=physical_disks_only
+        )
     elif sys.platform == 'linux':
-        return LinuxSystem(name=name)
+        return LinuxSystem(
+            name=name,
+            physical_disks_only=physical_disks_only
+        )
     else:
         raise PyDiskInfoParseError(
             f'Incompatible system type "{sys.platform}"'
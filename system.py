@@ -32,7 +32,7 @@ from human_readable_units import human_readable_units
 
 
 class SystemComponent(dict):
-    pass
+    __slots__ = ()
 
 
 class System(SystemComponent):
@@ -43,11 +43,22 @@ class System(SystemComponent):
     unless the object is unable to recognize the operating system. In that case
     the object will be empty, excpet for some information about the operating
     system itself. """
-
-    def __init__(self, name: str = None) -> None:
+    __slots__ = (
+        '_physical_disks',
+        '_partitions',
+        '_logical_disks',
+        '_physical_disks_only'
+    )
+
+    def __init__(
+        self,
+        name: str = None,
+        physical_disks_only: bool = False
+    ) -> None:
         self._set_name(name)
         self._set_type()
         self['Version'] = 'unknown'
+        self._physical_disks_only = physical_disks_only
         self._physical_disks: list['PhysicalDisk'] = []
         self._partitions: list['Partition'] = []
         self._logical_disks: list['LogicalDisk'] = []
@@ -112,6 +123,7 @@ class System(SystemComponent):
 
 class LogicalDisk(SystemComponent):
     """Class for logical disks/mount points"""
+    __slots__ = ('_system', '_partitions')
 
     def __init__(self, system: 'System') -> None:
         self._system: System = system
@@ -155,6 +167,7 @@ class Partition(SystemComponent):
     spanned volume. The partition may in that case not include a functional
     filesystem on its own, though its contents will be part of one.
     """
+    __slots__ = ('_physical_disk', '_logical_disks', 'isdummy')
 
     def __init__(self, physical_disk: 'PhysicalDisk') -> None:
         self._physical_disk: 'PhysicalDisk' = physical_disk
@@ -208,6 +221,8 @@ class Partition(SystemComponent):
 
 
 class DummyPartition(Partition):
+    __slots__ = ()
+
     def __init__(self, disk: 'PhysicalDisk', logical_disk: 'LogicalDisk'):
         super().__init__(disk)
         self.isdummy = True
@@ -219,6 +234,7 @@ class DummyPartition(Partition):
 
 class PhysicalDisk(SystemComponent):
     """Contains information about physical drives."""
+    __slots__ = ('_system', '_partitions')
 
     def __init__(self, system: SystemComponent) -> None:
         self._system = system
@@ -0,0 +1,109 @@
+from io import StringIO
+from unittest.mock import patch, MagicMock, Mock
+from linux_system import LinuxSystem
+from pydiskinfo import create_system
+
+
+file_data = {
+    '/proc/partitions': '\n'.join((
+        'major\tminor\t#blocks\tname',
+        '   8        0  976762584 sda',
+        '   8        1  976759808 sda1',
+        '   8       16 1953514584 sdb',
+        '   8       17  976761856 sdb1',
+        '   8       18  976750592 sdb2',
+        '   8       48 1953514584 sdd',
+        '   8       49     498688 sdd1',
+        '   8       50  976761856 sdd2',
+        '   8       51  976226304 sdd3',
+        '   8       32  976762584 sdc',
+        '   8       33  976759808 sdc1',
+        '   9        0 2929883136 md0',
+        ' 253        0  209715200 dm-0',
+        ' 253        1    8388608 dm-1',
+        ' 253        2 1734868992 dm-2',
+        ' 253        3 2929881088 dm-3',
+        ' 179        0   15558144 mmcblk0',
+        ' 179        1     262144 mmcblk0p1',
+        ' 179        2   15291904 mmcblk0p2',
+        ''
+    ))
+}
+
+df_output = '\n'.join((
+    'Filesystem                    Type         1B-blocks         Avail '
+    'Mounted on',
+    'udev                          devtmpfs    4152942592    4152942592 '
+    '/dev',
+    'tmpfs                         tmpfs        833921024     815149056 '
+    '/run',
+    '/dev/sda1                     ext4      500101021696  197152677888 '
+    '/',
+    'tmpfs                         tmpfs       4169596928    4169596928 '
+    '/dev/shm',
+    'tmpfs                         tmpfs          5242880       5242880 '
+    '/run/lock',
+    'tmpfs                         tmpfs       4169596928    4169596928 '
+    '/sys/fs/cgroup',
+    '/dev/sdd1                     vfat         509640704     506204160 '
+    '/boot/efi',
+    'tmpfs                         tmpfs        833916928     833916928 '
+    '/run/user/1000',
+    '/dev/mmcblk0p2                ext4       15381823488   12274655232 '
+    '/mnt/sdcard1',
+    '/dev/mmcblk0p1                vfat         264289280     232720896 '
+    '/mnt/sdcard2',
+    ''
+))
+
+
+_file_mocks = {}
+_EMPTY_FILE_MOCK = MagicMock()
+_EMPTY_SUBPROCESS_MOCK = MagicMock()
+
+
+def file_open_sf(filename, mode) -> MagicMock:
+    if filename == '/proc/partitions':
+        result = _file_mocks.get(filename)
+        if result is None:
+            result = MagicMock()
+            result.__enter__.return_value = StringIO(file_data[filename])
+            _file_mocks[filename] = result
+        result.__enter__.return_value.seek(0)
+        return result
+    return _EMPTY_FILE_MOCK
+
+
+def subprocess_run_sf(
+    arguments: tuple,
+    capture_output: bool,
+    text: bool
+) -> Mock:
+    if arguments[0] == 'df':
+        mock = Mock()
+        mock.stdout = df_output
+        return mock
+    return _EMPTY_SUBPROCESS_MOCK
+
+
+def create_linux_system(
+    name: str = None,
+    physical_disks_only: bool = False
+) -> LinuxSystem:
+    if not name:
+        name = 'Some system'
+    with patch(
+        'sys.platform',
+        'linux'
+    ), patch(
+        'linux_system.open',
+        side_effect=file_open_sf
+    ), patch(
+        'linux_system.subprocess.run',
+        side_effect=subprocess_run_sf
+    ), patch(
+        'linux_system.os'
+    ) as mock_os:
+        mock_os.uname.return_value = ('Linux', '', '4.19.0-20-test')
+        return create_system(name, physical_disks_only)
+
@@ -1,12 +1,70 @@
+from functools import lru_cache
+import re
 from unittest.mock import patch
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
-from io import StringIO
 from system import System
 from pydiskinfo import create_system
 from pdi_util import main
 
 
-class FakeWMILogicalDisk:
+DEFAULT_CONFIGURATION = (
+    'physicaldisk',
+    (
+        'partition',
+        ('logicaldisk',)
+    )
+)
+_WQL_SELECT = re.compile(r'SELECT (?P<names>.+) FROM (?P<wmi_class>\w+)')
+
+
+class FakeWMIProperty:
+    __slots__ = ('Name', 'Value')
+
+    def __init__(self, name: str, value: object) -> None:
+        self.Name = name
+        self.Value = value
+
+
+class FakeWMIInstance:
+    """Raw WMI instance as returned by a query"""
+    __slots__ = ('Properties_',)
+
+    def __init__(self, properties: tuple) -> None:
+        self.Properties_ = properties
+
+
+class FakeWMIObject:
+    """WMI object whose slots are its properties"""
+    __slots__ = ()
+
+    def select(self, names: tuple) -> FakeWMIInstance:
+        """Return the instance with only the named properties, like a WQL
+        SELECT. Unknown names make the query invalid, as they do in WMI."""
+        for each_name in names:
+            if each_name not in self.__slots__:
+                raise ValueError(
+                    f'Invalid query: {type(self).__name__} has no property '
+                    f'{each_name}'
+                )
+        return FakeWMIInstance(tuple(
+            FakeWMIProperty(each_name, getattr(self, each_name))
+            for each_name in names
+        ))
+
+
+class FakeWMILogicalDisk(FakeWMIObject):
+    __slots__ = (
+        'Description',
+        'DeviceID',
+        'DriveType',
+        'FileSystem',
+        'FreeSpace',
+        'MaximumComponentLength',
+        'Size',
+        'VolumeName',
+        'VolumeSerialNumber'
+    )
+
     def __init__(self, number: int) -> None:
         self.Description = 'Some description'
         self.DeviceID = f'device{number}'
@@ -19,9 +77,23 @@ class FakeWMILogicalDisk:
         self.VolumeSerialNumber = 'Some serial'
 
 
-class FakeWMIPartition:
+class FakeWMIPartition(FakeWMIObject):
+    __slots__ = (
+        'BlockSize',
+        'Bootable',
+        'BootPartition',
+        'Description',
+        'DeviceID',
+        'DiskIndex',
+        'Index',
+        'NumberOfBlocks',
+        'PrimaryPartition',
+        'Size',
+        'StartingOffset',
+        'Type'
+    )
+
     def __init__(self, number: int, disk_number: int) -> None:
-        self._logical_disks = []
         self.BlockSize = '512'
         self.Bootable = True
         self.BootPartition = True
@@ -35,16 +107,26 @@ class FakeWMIPartition:
         self.StartingOffset = '1048576'
         self.Type = 'Some type'
 
-    def associators(self, association: str) -> list:
-        return self._logical_disks
-
-    def _add_logical_disk(self, logical_disk: FakeWMILogicalDisk) -> None:
-        self._logical_disks.append(logical_disk)
 
+class FakeWMIPhysicalDisk(FakeWMIObject):
+    __slots__ = (
+        'Size',
+        'Index',
+        'DeviceID',
+        'MediaType',
+        'SerialNumber',
+        'Model',
+        'TotalSectors',
+        'TotalHeads',
+        'TotalCylinders',
+        'BytesPerSector',
+        'FirmwareRevision',
+        'InterfaceType',
+        'MediaLoaded',
+        'Status'
+    )
 
-class FakeWMIPhysicalDisk:
     def __init__(self, number: int) -> None:
-        self._partitions = []
         self.Size = '256052966400'
         self.Index = str(number)
         self.DeviceID = 'Some device id'
@@ -55,72 +137,131 @@ class FakeWMIPhysicalDisk:
         self.TotalHeads = '255'
         self.TotalCylinders = '31130'
         self.BytesPerSector = '512'
-        self.FirmWare = 'Some firmware'
+        self.FirmwareRevision = 'Some firmware'
         self.InterfaceType = 'Some interface'
         self.MediaLoaded = True
         self.Status = 'OK'
 
-    def associators(self, association: str) -> list:
-        return self._partitions
 
-    def _add_partition(self, partition: FakeWMIPartition) -> None:
-        """Add another partition to the physical disk"""
-        self._partitions.append(partition)
+class FakeWMILogicalDiskToPartition(FakeWMIObject):
+    __slots__ = ('Antecedent', 'Dependent')
+
+    def __init__(
+        self,
+        partition: FakeWMIPartition,
+        logical_disk: FakeWMILogicalDisk
+    ) -> None:
+        self.Antecedent = (
+            '\\\\SOMESYSTEM\\root\\cimv2:'
+            f'Win32_DiskPartition.DeviceID="{partition.DeviceID}"'
+        )
+        self.Dependent = (
+            '\\\\SOMESYSTEM\\root\\cimv2:'
+            f'Win32_LogicalDisk.DeviceID="{logical_disk.DeviceID}"'
+        )
+
+
+class OutputSink:
+    """Minimal write-only stream that collects everything written to it"""
+    __slots__ = ('_parts',)
+
+    def __init__(self) -> None:
+        self._parts = []
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def getvalue(self) -> str:
+        return ''.join(self._parts)
 
 
 class FakeWMIcursor:
     def __init__(self, configuration: list = None) -> None:
-        self._physical_disk_number = 0
-        self._logical_disk_number = 0
-        self._physical_disks = self._parse_configuration(configuration)
+        self._physical_disks = []
+        self._partitions = []
+        self._logical_disks = []
+        self._logical_disks_to_partitions = []
+        self._parse_configuration(configuration)
+
+    def _parse_configuration(self, configuration: list) -> None:
+        """Build the fake WMI objects from a nested configuration.
 
-    def _parse_configuration(self, configuration: list) -> list:
+        Strings are physical disks at the top level and partitions one level
+        down. A list or tuple following an item holds the children of that
+        item."""
         if configuration is None:
-            configuration = [
-                'physicaldisk',
-                [
-                    'partition',
-                    ['logicaldisk']
-                ]
-            ]
-        physical_disks = []
-        physical_disk = None
+            configuration = DEFAULT_CONFIGURATION
         for each_physical_disk in configuration:
-            if isinstance(each_physical_disk, list):
+            if isinstance(each_physical_disk, (list, tuple)):
                 partition_number = 0
                 partition = None
                 for each_partition in each_physical_disk:
-                    if isinstance(each_partition, list):
+                    if isinstance(each_partition, (list, tuple)):
                         for each_logical_disk in each_partition:
-                            partition._add_logical_disk(
-                                FakeWMILogicalDisk(
-                                    number=self._logical_disk_number
+                            logical_disk = FakeWMILogicalDisk(
+                                number=len(self._logical_disks)
+                            )
+                            self._logical_disks.append(logical_disk)
+                            self._logical_disks_to_partitions.append(
+                                FakeWMILogicalDiskToPartition(
+                                    partition,
+                                    logical_disk
                                 )
                             )
-                            self._logical_disk_number += 1
                     else:
                         partition = FakeWMIPartition(
                             number=partition_number,
-                            disk_number=self._physical_disk_number
+                            disk_number=len(self._physical_disks) - 1
                         )
                         partition_number += 1
-                        physical_disk._add_partition(partition)
+                        self._partitions.append(partition)
             else:
-                physical_disk = FakeWMIPhysicalDisk(
-                    number=self._physical_disk_number
+                self._physical_disks.append(
+                    FakeWMIPhysicalDisk(number=len(self._physical_disks))
                 )
-                self._physical_disk_number += 1
-                physical_disks.append(physical_disk)
-        return physical_disks
 
     def Win32_DiskDrive(self) -> list:
         return self._physical_disks
 
+    def Win32_DiskPartition(self) -> list:
+        return self._partitions
+
+    def Win32_LogicalDisk(self) -> list:
+        return self._logical_disks
+
+    def Win32_LogicalDiskToPartition(self) -> list:
+        return self._logical_disks_to_partitions
 
-def get_windows_system(name: str = '', configuration: list = None) -> System:
+    def _raw_query(self, wql: str) -> list:
+        """Return the selected properties of the instances a WQL query
+        selects from"""
+        match = _WQL_SELECT.fullmatch(wql)
+        if not match:
+            raise ValueError(f'Invalid query: {wql}')
+        names = tuple(
+            each_name.strip() for each_name in match['names'].split(',')
+        )
+        instances = getattr(self, match['wmi_class'])()
+        if names == ('*',):
+            return [
+                each_instance.select(each_instance.__slots__)
+                for each_instance in instances
+            ]
+        return [each_instance.select(names) for each_instance in instances]
+
+
+def get_windows_system(
+    name: str = '',
+    configuration: list = None,
+    physical_disks_only: bool = False
+) -> System:
     """return a fake System object for test purposes"""
     with patch_windows(configuration=configuration, name=name):
-        system = create_system()
+        system = create_system(physical_disks_only=physical_disks_only)
     return system
 
 
@@ -129,56 +270,76 @@ def patch_windows(
     configuration: list = None,
     name: str = ''
 ):
-    def create_fake_cursor() -> FakeWMIcursor:
-        return FakeWMIcursor(configuration)
+    cursor = FakeWMIcursor(configuration)
 
     with patch(
         target='wmi.WMI',
-        new=create_fake_cursor
+        new=lambda: cursor
     ), patch(
         target='sys.platform',
         new='win32'
     ), patch(
         target='socket.gethostname'
     ) as fake_gethostname, patch(
-        target='windows_system.platform'
-    ) as fake_windows_platform, patch(
+        target='windows_system._VERSION',
+        new='test 10'
+    ), patch(
         target='system.platform'
     ) as fake_system_platform:
-        fake_windows_platform.win32_edition.return_value = 'test'
-        fake_windows_platform.win32_ver.return_value = ['notused', '10']
         fake_system_platform.system.return_value = 'Some type'
         if name:
             fake_gethostname.return_value = name
         else:
             fake_gethostname.return_value = 'Some system'
-        yield
+        yield cursor
+
+
+def _freeze(configuration: list) -> tuple:
+    """Return the configuration with every nested list turned into a tuple"""
+    if isinstance(configuration, (list, tuple)):
+        return tuple(_freeze(each_item) for each_item in configuration)
+    return configuration
 
 
 def get_windows_output(
-    arguments: list = None,
+    arguments: tuple = (),
     configuration: list = None,
     name: str = ''
 ) -> str:
-    """Return output from pydiskinfo given certain arguments"""
-    if arguments is None:
-        arguments = []
+    """Return output from pydiskinfo given certain arguments
+
+    The output only depends on the arguments, the configuration and the
+    name, so it is cached on those."""
+    return _get_windows_output(
+        tuple(arguments),
+        _freeze(configuration),
+        name
+    )
+
+
+@lru_cache(maxsize=64)
+def _get_windows_output(
+    arguments: tuple,
+    configuration: tuple,
+    name: str
+) -> str:
     with patch_windows(
         configuration=configuration,
         name=name
     ), patch(
         target='sys.argv',
-        new=['pydiskinfo'] + arguments
+        new=['pydiskinfo', *arguments]
     ), redirect_stdout(
-        new_target=StringIO()
+        new_target=OutputSink()
     ) as output_stream, redirect_stderr(
-        new_target=StringIO()
+        new_target=OutputSink()
     ) as error_stream:
         main()
-    if error_stream.getvalue():
+    errors = error_stream.getvalue()
+    if errors:
         raise AssertionError(
             'pdi_util.main returned some errors\n'
-            f'stderr:\n{error_stream.getvalue()}\n'
+            f'stderr:\n{errors}\n'
             f'stdout:\n{output_stream.getvalue()}\n'
         )
     return output_stream.getvalue()
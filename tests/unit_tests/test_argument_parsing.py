@@ -176,6 +176,15 @@ class TestSanitizedArgumentsClass(TestCase):
         list_from_partitions and set it to False"""
         self.assertFalse(SanitizedArguments().list_from_partitions)
 
+    def test_physical_disks_only(self) -> None:
+        """Test that physical_disks_only is only set when nothing below the
+        physical disks will be listed"""
+        self.assertTrue(SanitizedArguments().physical_disks_only)
+        self.assertTrue(SanitizedArguments({'dp': 'ms'}).physical_disks_only)
+        self.assertFalse(SanitizedArguments({'dp': 'P'}).physical_disks_only)
+        self.assertFalse(SanitizedArguments({'l': True}).physical_disks_only)
+        self.assertFalse(SanitizedArguments({'p': True}).physical_disks_only)
+
     def test_defautls_system_name(self) -> None:
         """Test that a default SanitizedArguments produces a property
         system_name and set it to ''"""
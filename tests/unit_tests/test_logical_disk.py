@@ -31,25 +31,19 @@ class LogicalDiskTests(TestCase):
         )
 
 
-class WindowsLogicalDiskTests(TestCase):
-    def setUp(self) -> None:
-        class FakeWmiLogicalDisk:
-            def __init__(self) -> None:
-                self.DeviceID = 'C:'
-        self.fake_wmi_logical_disk = FakeWmiLogicalDisk()
+_WMI_LOGICAL_DISK = {'DeviceID': 'C:'}
+
 
+class WindowsLogicalDiskTests(TestCase):
     def test_has_all_properties(self) -> None:
-        windows_logical_disk = WindowsLogicalDisk(None, None)
+        windows_logical_disk = WindowsLogicalDisk({}, None)
         self.assertEqual(
             sorted(windows_logical_disk),
             property_list
         )
 
     def test_get_device_id_etc(self) -> None:
-        windows_logical_disk = WindowsLogicalDisk(
-            self.fake_wmi_logical_disk,
-            None
-        )
+        windows_logical_disk = WindowsLogicalDisk(_WMI_LOGICAL_DISK, None)
         device_id, name, mounted = (
             windows_logical_disk.
             _get_device_id_name_mounted()
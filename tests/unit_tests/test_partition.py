@@ -3,17 +3,13 @@ from windows_system import WindowsPartition
 from tests.fake_wmi import get_windows_system
 
 
+_WMI_PARTITION = {'PrimaryPartition': True}
+
+
 class TestWindowsPartition(TestCase):
-    def setUp(self) -> None:
-        class FakeWmiPartition:
-            def __init__(self) -> None:
-                self.PrimaryPartition = True
-        self.fake_wmi_partition = FakeWmiPartition()
-
-    def test_get_primary_partition(self) -> None:
-        partition = WindowsPartition(self.fake_wmi_partition, None)
-        primary = partition._get_primary_partition()
-        self.assertIs(primary, True)
+    def test_primary_partition(self) -> None:
+        partition = WindowsPartition(_WMI_PARTITION, None)
+        self.assertIs(partition['Primary'], True)
 
 
 class InterfaceTests(TestCase):
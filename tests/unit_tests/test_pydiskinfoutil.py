@@ -1,14 +1,200 @@
 from unittest import TestCase
-import subprocess
+from functools import lru_cache
 import os
-from contextlib import redirect_stdout, redirect_stderr
-from io import StringIO
+import re
 from unittest.mock import patch
-from argument_parsing import get_arguments
+from argument_parsing import get_arguments, SanitizedArguments
 import pdi_util as pdi_util
 from tests.fake_wmi import get_windows_system, get_windows_output
 
 
+_EXPECTED_DEFAULT = '\n'.join((
+    'System -- Name: Some system, Type: Windows, Version: test 10',
+    '  Physical Disk -- Disk Number: 0, Path: Some device id, '
+    'Media: Some media type, Serial: Some serial, Size: 256.05GB',
+    '    Partition -- Device I.D.: Partition0 Disk0, '
+    'Type: Some type, Size: 104.86MB, Offset: 1048576',
+    '      Logical Disk -- Label: Some label, '
+    'Filesystem: Some filesystem, Free Space: 800.00MB',
+    ''
+))
+
+_HELP_EXCERPT = (
+    'The default behaviour is to list all devices from the system'
+    ' down through\nphysical disk and partitions, to logical disks.'
+    ' The partitions are only\n"physical" partitions'
+)
+
+_WMI_SETUP_INDENT = (
+    'physical disk',
+    (
+        'partition',
+        (
+            'logical disk',
+            'logical disk'
+        ),
+        'partition',
+        'partition',
+        (
+            'logical disk',
+        )
+    ),
+    'physical disk',
+    'physical disk',
+    (
+        'partition',
+        (
+            'logical disk',
+        ),
+        'partition',
+        (
+            'logical disk',
+        )
+    )
+)
+
+_PAT_INDENT_DISKS = re.compile(
+    r'System -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Logical Disk -- [\S ]+\n'
+    r'      Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Logical Disk -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Logical Disk -- [\S ]+\n'
+)
+
+_PAT_INDENT_LOGICAL = re.compile(
+    r'System -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Physical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Physical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Physical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Physical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Physical Disk -- [\S ]+\n'
+)
+
+_PAT_INDENT_PARTITIONS = re.compile(
+    r'System -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'    Logical Disk -- [\S ]+\n'
+    r'    Logical Disk -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'    Logical Disk -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'    Logical Disk -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'    Logical Disk -- [\S ]+\n'
+)
+
+_PAT_INDENT_PARTITIONS_ONLY = re.compile(
+    r'System -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+    r'  Partition -- [\S ]+\n'
+)
+
+_PAT_INDENT_DISKS_ONLY = re.compile(
+    r'System -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+)
+
+_PAT_INDENT_LOGICAL_ONLY = re.compile(
+    r'System -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+    r'  Logical Disk -- [\S ]+\n'
+)
+
+_PAT_PHYSICAL_DISK = re.compile(
+    'Physical Disk -- '
+    'Size: 256.05GB, '
+    r'Disk Number: \d+, '
+    'Device I.D.: Some device id, '
+    'Path: Some device id, '
+    'Media: Some media type, '
+    'Serial: Some serial, '
+    'Model: Some model, '
+    'Sectors: 500103450, '
+    'Bytes per Sector: 512, '
+    'Heads: 255, '
+    'Cylinders: 31130, '
+    'Firmware: Some firmware, '
+    'Interface: Some interface, '
+    'Media Loaded: True, '
+    'Status: OK'
+)
+
+_PAT_PARTITION = re.compile(
+    'Partition -- '
+    'Blocksize: 512, '
+    'Bootable: True, '
+    'Active: True, '
+    'Description: Some description, '
+    'Path: , '
+    r'Device I.D.: Partition\d+ Disk\d+, '
+    r'Disk Number: \d+, '
+    r'Partition Number: \d+, '
+    'Blocks: 204800, '
+    'Primary: True, '
+    'Size: 104.86MB, '
+    'Offset: 1048576, '
+    'Type: Some type'
+)
+
+_PAT_LOGICAL_DISK = re.compile(
+    'Logical Disk -- '
+    'Description: Some description, '
+    r'Device I.D.: device\d+, '
+    'Type: Unknown, '
+    'Filesystem: Some filesystem, '
+    'Free Space: 800.00MB, '
+    'Max Component Length: 255, '
+    r'Name: device\d+, '
+    'Path: , '
+    r'Mounted: device\d+\\, '
+    'Size: 1.00GB, '
+    'Label: Some label, '
+    'Serial: Some serial'
+)
+
+_PAT_LINE_ASSEMBLER = re.compile(
+    r'^System -- [\S ]+\n'
+    r'  Physical Disk -- [\S ]+\n'
+    r'    Partition -- [\S ]+\n'
+    r'      Logical Disk -- [\S ]+$'
+)
+
+
+@lru_cache(maxsize=None)
+def _get_arguments(*arguments: str) -> SanitizedArguments:
+    """Return sanitized arguments for a command line, parsing it only once"""
+    with patch('sys.argv', ['pydiskinfo', *arguments]):
+        return get_arguments()
+
+
 class PackageTests(TestCase):
     def test_package_execution(self) -> None:
 
@@ -22,147 +208,54 @@ class PackageTests(TestCase):
 class OutputTests(TestCase):
     """Testing the command line input (arguments) and output"""
     def test_default_output_on_windows(self) -> None:
-        self.assertRegex(
-            get_windows_output(),
-            'System -- Name: Some system, Type: Windows, Version: test 10\n'
-            r'  Physical Disk -- Disk Number: \d+, Path: Some device id, '
-            'Media: Some media type, Serial: Some serial, Size: 256.05GB\n'
-            r'    Partition -- Device I.D.: Partition\d+ Disk\d+, '
-            'Type: Some type, Size: 104.86MB, Offset: 1048576\n'
-            '      Logical Disk -- Label: Some label,'
-            ' Filesystem: Some filesystem, Free Space: 800.00MB\n'
-        )
+        self.assertMultiLineEqual(get_windows_output(), _EXPECTED_DEFAULT)
 
     def test_help_output_on_windows(self) -> None:
-        self.assertRegex(
-            get_windows_output(['-h']),
-            r'The default behaviour is to list all devices from the system'
-            r' down through\nphysical disk and partitions, to logical disks\.'
-            r' The partitions are only\n"physical" partitions'
-        )
+        self.assertIn(_HELP_EXCERPT, get_windows_output(['-h']))
 
     def test_indentations(self) -> None:
         """Test that indentations are correctly expanding with items"""
-        wmi_setup = [
-            'physical disk',
-            [
-                'partition',
-                [
-                    'logical disk',
-                    'logical disk'
-                ],
-                'partition',
-                'partition',
-                [
-                    'logical disk'
-                ]
-            ],
-            'physical disk',
-            'physical disk',
-            [
-                'partition',
-                [
-                    'logical disk'
-                ],
-                'partition',
-                [
-                    'logical disk'
-                ]
-            ]
-        ]
-        self.assertRegex(
-            get_windows_output(['-dp', 'Pi', '-pp', 'Ldi'], wmi_setup),
-            r'^System -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Logical Disk -- [\S ]+?\n'
-            r'      Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Logical Disk -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Logical Disk -- [\S ]+?\n$'
-        )
-        self.assertRegex(
-            get_windows_output(['-dp', 'Pi', '-pp', 'LDdi', '-l'], wmi_setup),
-            r'^System -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Physical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Physical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Physical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Physical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Physical Disk -- [\S ]+?\n$'
+        output = get_windows_output(
+            ['-dp', 'Pi', '-pp', 'Ldi'],
+            _WMI_SETUP_INDENT
         )
-        self.assertRegex(
-            get_windows_output(['-dp', 'Pi', '-pp', 'LDdi', '-p'], wmi_setup),
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'    Logical Disk -- [\S ]+?\n'
-            r'    Logical Disk -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'    Logical Disk -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'    Logical Disk -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'    Logical Disk -- [\S ]+?\n$'
+        self.assertTrue(_PAT_INDENT_DISKS.fullmatch(output), output)
+        output = get_windows_output(
+            ['-dp', 'Pi', '-pp', 'LDdi', '-l'],
+            _WMI_SETUP_INDENT
         )
-        self.assertRegex(
-            get_windows_output(['-dp', 'i', '-pp', 'di', '-p'], wmi_setup),
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n$'
+        self.assertTrue(_PAT_INDENT_LOGICAL.fullmatch(output), output)
+        output = get_windows_output(
+            ['-dp', 'Pi', '-pp', 'LDdi', '-p'],
+            _WMI_SETUP_INDENT
         )
-        self.assertRegex(
-            get_windows_output(
-                ['-dp', 'i', '-pp', 'di', '-lp', 'V', '-p', '-l'],
-                wmi_setup
-            ),
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n$'
+        self.assertTrue(_PAT_INDENT_PARTITIONS.fullmatch(output), output)
+        output = get_windows_output(
+            ['-dp', 'i', '-pp', 'di', '-p'],
+            _WMI_SETUP_INDENT
         )
-        self.assertRegex(
-            get_windows_output(['-dp', 'i'], wmi_setup),
-            r'^System -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n$'
-        )
-        self.assertRegex(
-            get_windows_output(['-lp', 'V', '-l'], wmi_setup),
-            r'^System -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n$'
+        self.assertTrue(_PAT_INDENT_PARTITIONS_ONLY.fullmatch(output), output)
+        output = get_windows_output(
+            ['-dp', 'i', '-pp', 'di', '-lp', 'V', '-p', '-l'],
+            _WMI_SETUP_INDENT
         )
+        self.assertTrue(_PAT_INDENT_PARTITIONS_ONLY.fullmatch(output), output)
+        output = get_windows_output(['-dp', 'i'], _WMI_SETUP_INDENT)
+        self.assertTrue(_PAT_INDENT_DISKS_ONLY.fullmatch(output), output)
+        output = get_windows_output(['-lp', 'V', '-l'], _WMI_SETUP_INDENT)
+        self.assertTrue(_PAT_INDENT_LOGICAL_ONLY.fullmatch(output), output)
 
 
 class StringFunctions(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.windows_system = get_windows_system()
+        cls.physical_disk = cls.windows_system.get_physical_disks()[0]
+        cls.partition = cls.physical_disk.get_partitions()[0]
+        cls.logical_disk = cls.partition.get_logical_disks()[0]
+
     def test_str_system(self) -> None:
-        system = get_windows_system()
-        system_string = pdi_util.stringify(system)
+        system_string = pdi_util.stringify(self.windows_system)
         self.assertEqual(
             system_string,
             'System -- '
@@ -171,109 +264,34 @@ class StringFunctions(TestCase):
             'Version: test 10'
         )
 
-    @patch('sys.argv', [
-        'pydiskinfo',
-        '-dp',
-        'PXSsidptnmcbhCfIMa'
-    ])
     def test_str_physical_disk(self) -> None:
-        self.maxDiff = None
         physical_disk_string = pdi_util.stringify(
-            get_windows_system().get_physical_disks()[0],
-            get_arguments()
-        )
-        self.assertRegex(
-            physical_disk_string,
-            'Physical Disk -- '
-            'Size: 256.05GB, '
-            r'Disk Number: \d+, '
-            'Device I.D.: Some device id, '
-            'Path: Some device id, '
-            'Media: Some media type, '
-            'Serial: Some serial, '
-            'Model: Some model, '
-            'Sectors: 500103450, '
-            'Bytes per Sector: 512, '
-            'Heads: 255, '
-            'Cylinders: 31130, '
-            'Firmware: Some firmware, '
-            'Interface: Some interface, '
-            'Media Loaded: True, '
-            'Status: OK'
+            self.physical_disk,
+            _get_arguments('-dp', 'PXSsidptnmcbhCfIMa')
         )
+        self.assertRegex(physical_disk_string, _PAT_PHYSICAL_DISK)
 
-    @patch('sys.argv', [
-        'pydiskinfo',
-        '-pp',
-        'LXDbBoxpdiNcrSset',
-    ])
     def test_str_partition(self) -> None:
-        self.maxDiff = None
         partition_string = pdi_util.stringify(
-            get_windows_system().get_physical_disks()[0].get_partitions()[0],
-            get_arguments()
-        )
-        self.assertRegex(
-            partition_string,
-            'Partition -- '
-            'Blocksize: 512, '
-            'Bootable: True, '
-            'Active: True, '
-            'Description: Some description, '
-            'Path: , '
-            r'Device I.D.: Partition\d+ Disk\d+, '
-            r'Disk Number: \d+, '
-            r'Partition Number: \d+, '
-            'Blocks: 204800, '
-            'Primary: True, '
-            'Size: 104.86MB, '
-            'Offset: 1048576, '
-            'Type: Some type'
+            self.partition,
+            _get_arguments('-pp', 'LXDbBoxpdiNcrSset')
         )
+        self.assertRegex(partition_string, _PAT_PARTITION)
 
-    @patch('sys.argv', [
-        'pydiskinfo',
-        '-lp',
-        'PXxdtfFUvpMSsVn',
-    ])
     def test_str_logical_disk(self) -> None:
-        self.maxDiff = None
         logical_disk_string = pdi_util.stringify(
-            get_windows_system()
-            .get_physical_disks()[0]
-            .get_partitions()[0]
-            .get_logical_disks()[0],
-            get_arguments()
-        )
-        self.assertRegex(
-            logical_disk_string,
-            'Logical Disk -- '
-            'Description: Some description, '
-            r'Device I.D.: device\d+, '
-            'Type: Unknown, '
-            'Filesystem: Some filesystem, '
-            'Free Space: 800.00MB, '
-            'Max Component Length: 255, '
-            r'Name: device\d+, '
-            'Path: , '
-            r'Mounted: device\d+\\, '
-            'Size: 1.00GB, '
-            'Label: Some label, '
-            'Serial: Some serial'
+            self.logical_disk,
+            _get_arguments('-lp', 'PXxdtfFUvpMSsVn')
         )
+        self.assertRegex(logical_disk_string, _PAT_LOGICAL_DISK)
 
 
 class LineAssemblerTests(TestCase):
     def test_str_output(self) -> None:
-        with patch('sys.argv', ['pydiskinfo']):
-            arguments = get_arguments()
         self.assertRegex(
             str(pdi_util.LineAssembler(
-                arguments,
+                _get_arguments(),
                 get_windows_system()
             )),
-            r'^System -- [\S ]+\n'
-            r'  Physical Disk -- [\S ]+\n'
-            r'    Partition -- [\S ]+\n'
-            r'      Logical Disk -- [\S ]+$'
+            _PAT_LINE_ASSEMBLER
         )
@@ -8,8 +8,9 @@ from tests.fake_wmi import get_windows_system
 
 
 class FactoryTest(TestCase):
-    def setUp(self) -> None:
-        self.windows_system = get_windows_system()
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.windows_system = get_windows_system()
 
     """Test object creation"""
     def test_get_system_windows(self) -> None:
@@ -23,26 +24,21 @@ class FactoryTest(TestCase):
 
 class InformationAccess(TestCase):
     """testing library user's information access"""
-    def setUp(self) -> None:
-        self.windows_system = get_windows_system()
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.windows_system = get_windows_system()
 
     def test_get_physical_disks(self) -> None:
         self.assertIsInstance(self.windows_system.get_physical_disks(), tuple)
-        [self.assertIsInstance(
-            physical_disk,
-            PhysicalDisk
-        ) for physical_disk in self.windows_system.get_physical_disks()]
+        for physical_disk in self.windows_system.get_physical_disks():
+            self.assertIsInstance(physical_disk, PhysicalDisk)
 
     def test_get_partitions(self) -> None:
         self.assertIsInstance(self.windows_system.get_partitions(), tuple)
-        [self.assertIsInstance(
-            partition,
-            Partition
-        ) for partition in self.windows_system.get_partitions()]
+        for partition in self.windows_system.get_partitions():
+            self.assertIsInstance(partition, Partition)
 
     def test_get_logical_disks(self) -> None:
         self.assertIsInstance(self.windows_system.get_logical_disks(), tuple)
-        [self.assertIsInstance(
-            logical_disk,
-            LogicalDisk
-        ) for logical_disk in self.windows_system.get_logical_disks()]
+        for logical_disk in self.windows_system.get_logical_disks():
+            self.assertIsInstance(logical_disk, LogicalDisk)
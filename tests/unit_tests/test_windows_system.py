@@ -0,0 +1,134 @@
+from unittest import TestCase
+from unittest.mock import patch
+from pydiskinfo import create_system
+from windows_system import (
+    _get_reference_key,
+    WindowsLogicalDisk,
+    WindowsPartition,
+    WindowsPhysicalDisk
+)
+from tests.fake_wmi import get_windows_system, patch_windows
+
+
+class ReferenceKeyTests(TestCase):
+    def test_get_reference_key(self) -> None:
+        self.assertEqual(
+            _get_reference_key(
+                '\\\\SOMESYSTEM\\root\\cimv2:'
+                'Win32_DiskPartition.DeviceID="Disk #0, Partition #1"'
+            ),
+            'Disk #0, Partition #1'
+        )
+
+    def test_get_escaped_reference_key(self) -> None:
+        self.assertEqual(
+            _get_reference_key(
+                '\\\\SOMESYSTEM\\root\\cimv2:'
+                'Win32_DiskDrive.DeviceID="\\\\\\\\.\\\\PHYSICALDRIVE0"'
+            ),
+            '\\\\.\\PHYSICALDRIVE0'
+        )
+
+    def test_get_missing_reference_key(self) -> None:
+        self.assertEqual(_get_reference_key('Win32_LogicalDisk'), '')
+
+
+class PhysicalDisksOnlyTests(TestCase):
+    def test_physical_disks_only(self) -> None:
+        system = get_windows_system(physical_disks_only=True)
+        self.assertEqual(len(system.get_physical_disks()), 1)
+        self.assertEqual(system.get_partitions(), ())
+        self.assertEqual(system.get_logical_disks(), ())
+
+    def test_physical_disks_only_queries(self) -> None:
+        with patch_windows() as cursor, patch.object(
+            cursor,
+            '_raw_query',
+            wraps=cursor._raw_query
+        ) as fake_raw_query:
+            create_system(physical_disks_only=True)
+        self.assertEqual(fake_raw_query.call_count, 1)
+        self.assertTrue(
+            fake_raw_query.call_args.args[0].endswith(' FROM Win32_DiskDrive')
+        )
+
+
+class FieldDefaultTests(TestCase):
+    def assert_defaults(self, row: dict) -> None:
+        physical_disk = WindowsPhysicalDisk(row, None)
+        self.assertEqual(physical_disk['Size'], -1)
+        self.assertEqual(physical_disk['Disk Number'], -1)
+        self.assertEqual(physical_disk['Sectors'], -1)
+        self.assertEqual(physical_disk['Bytes per Sector'], -1)
+        self.assertEqual(physical_disk['Path'], '')
+        self.assertEqual(physical_disk['Serial'], '')
+        self.assertEqual(physical_disk['Firmware'], 'Unspecified')
+        self.assertEqual(physical_disk['Media Loaded'], False)
+        partition = WindowsPartition(row, physical_disk)
+        self.assertEqual(partition['Blocksize'], -1)
+        self.assertEqual(partition['Offset'], -1)
+        self.assertEqual(partition['Size'], 0)
+        self.assertEqual(partition['Type'], '')
+        self.assertEqual(partition['Primary'], False)
+        logical_disk = WindowsLogicalDisk(row, None)
+        self.assertEqual(logical_disk['Filesystem'], 'unknown')
+        self.assertEqual(logical_disk['Free Space'], 0)
+        self.assertEqual(logical_disk['Max Component Length'], 0)
+        self.assertEqual(logical_disk['Size'], 0)
+        self.assertEqual(logical_disk['Label'], '')
+        self.assertEqual(logical_disk['Serial'], '')
+
+    def test_missing_fields(self) -> None:
+        self.assert_defaults({})
+
+    def test_null_fields(self) -> None:
+        self.assert_defaults({
+            'Size': None,
+            'Index': None,
+            'TotalSectors': None,
+            'BytesPerSector': None,
+            'DeviceID': None,
+            'SerialNumber': None,
+            'FirmwareRevision': None,
+            'MediaLoaded': None,
+            'BlockSize': None,
+            'StartingOffset': None,
+            'Type': None,
+            'PrimaryPartition': None,
+            'FileSystem': None,
+            'FreeSpace': None,
+            'MaximumComponentLength': None,
+            'VolumeName': None,
+            'VolumeSerialNumber': None
+        })
+
+    def test_unconvertible_fields(self) -> None:
+        self.assert_defaults({
+            'Size': 'x',
+            'Index': 'x',
+            'TotalSectors': 'x',
+            'BytesPerSector': 'x',
+            'BlockSize': 'x',
+            'StartingOffset': 'x',
+            'FileSystem': 1,
+            'FreeSpace': 'x',
+            'MaximumComponentLength': 'x',
+            'VolumeName': 1,
+            'VolumeSerialNumber': 1
+        })
+
+
+class DriveTypeTests(TestCase):
+    def test_drive_type(self) -> None:
+        for drive_type, expected in (
+            (-1, 'Unknown'),
+            (None, 'Unknown'),
+            (7, 'Unknown'),
+            (3, 'Local Disk')
+        ):
+            with self.subTest(drive_type=drive_type):
+                logical_disk = WindowsLogicalDisk(
+                    {'DriveType': drive_type},
+                    None
+                )
+                self.assertEqual(logical_disk['Type'], expected)
@@ -1,10 +1,95 @@
 # commandline tests
 from unittest import TestCase
-from unittest.mock import patch
 import re
 from tests.fake_wmi import get_windows_output
 
 
+_SIZE = r'-?[\d\.]+[GMKTP]?B?'
+_OFFSET = r'-?\d+'
+_SYSTEM_LINE = r'^System -- [\S ]+?\n'
+
+
+def _item_line(item: str, level: int) -> str:
+    """Return a pattern for one line of the listing, indented to level"""
+    return rf'{"  " * level}{item} -- [\S ]+?\n'
+
+
+_DEFAULT_LINE_RES = (
+    re.compile(
+        r'^System -- Name: [\S ]*, Type: [\S ]*, Version: [\S ]*$'
+    ),
+    re.compile(
+        r'^  Physical Disk -- Disk Number: [\S ]*, Path: [\S ]*'
+        r', Media: [\S ]*, Serial: [\S ]*'
+        rf', Size: {_SIZE}$'
+    ),
+    re.compile(
+        r'^    Partition -- Device I.D.: [\S ]*, Type: [\S ]*'
+        rf', Size: {_SIZE}, Offset: {_OFFSET}$'
+    ),
+    re.compile(
+        r'^      Logical Disk -- Label: [\S ]*, Filesystem: [\S ]*'
+        rf', Free Space: {_SIZE}$'
+    )
+)
+_HELP_EXCERPTS = (
+    'Start listing from a logical disk viewpoint. Remember',
+    'according to the string, except for the partition list.\n'
+    'Default: -dp Piptns\n',
+    '\nLogical disk properties:\n'
+)
+_FILTER_OUT_RE = re.compile(
+    r'^System -- Name: [\S ]*, Type: [\S ]*, Version: [\S ]*\n'
+    r'  Physical Disk -- Size: \d+, Heads: \d+, Media: [\S ]*'
+    r', Status: [\S ]*\n'
+    r'    Partition -- Primary: (True|False), Size: \d+'
+    r', Type: [\S ]*\n'
+    r'      Logical Disk -- Label: [\S ]*, Mounted: [\S ]*,'
+    r' Serial: [\S ]*\n$'
+)
+_L_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Logical Disk', 1)
+    + _item_line('Partition', 2)
+    + _item_line('Physical Disk', 3)
+    + '$'
+)
+_P_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Partition', 1)
+    + _item_line('Logical Disk', 2)
+    + '$'
+)
+_P_L_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Partition', 1)
+    + _item_line('Physical Disk', 2)
+    + '$'
+)
+_DISKS_ONLY_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Physical Disk', 1)
+    + '$'
+)
+_NO_LOGICAL_DISKS_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Physical Disk', 1)
+    + _item_line('Partition', 2)
+    + '$'
+)
+_NO_PHYSICAL_DISKS_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Logical Disk', 1)
+    + _item_line('Partition', 2)
+    + '$'
+)
+_PARTITIONS_ONLY_OUT_RE = re.compile(
+    _SYSTEM_LINE
+    + _item_line('Partition', 1)
+    + '$'
+)
+
+
 class CommandlineTests(TestCase):
     def test_default_commandline_usage(self) -> None:
         """
@@ -12,160 +97,89 @@ class CommandlineTests(TestCase):
         perspective.
         """
 
-        """
-        Charlotte run the command pdiutil from the command line interface.
-        """
-        output = get_windows_output()
-        """
-        Charlotte can see some output describing the disks connected to her pc
-        """
-        out_re = re.compile(
-            r'^System -- Name: [\S ]*, Type: [\S ]*, Version: [\S ]*\n.*'
-            r'Physical Disk -- Disk Number: [\S ]*, Path: [\S ]*'
-            r', Media: [\S ]*, Serial: [\S ]*, Size: -?[\d\.]+[GMKTP]?B?\n.*'
-            r'Partition -- Device I.D.: [\S ]*, Type: [\S ]*'
-            r', Size: -?[\d\.]+[GMKTP]?B?, Offset: -?\d+\n.*'
-            r'Logical Disk -- Label: [\S ]*, Filesystem: [\S ]*'
-            r', Free Space: -?[\d\.]+[GMKTP]?B?\n',
-            re.DOTALL
-        )
-        self.assertRegex(
-            output,
-            out_re
-        )
+        with self.subTest(arguments=[]):
+            # Charlotte run the command pdiutil from the command line
+            # interface.
+            output = get_windows_output()
+            # Charlotte can see some output describing the disks connected to
+            # her pc
+            lines = output.splitlines()
+            self.assertEqual(len(lines), len(_DEFAULT_LINE_RES), output)
+            for line_re, line in zip(_DEFAULT_LINE_RES, lines):
+                self.assertRegex(line, line_re)
 
-        """
-        Charlotte tries the regular help option -h, and sees some help text
-        describing options
-        """
-        output = get_windows_output(['-h'])
-        out_re = re.compile(
-            r'.+Start listing from a logical disk viewpoint\. Remember.+'
-            r'according to the string, except for the partition list\.\n'
-            r'Default: -dp Piptns\n.+'
-            r'\nLogical disk properties:\n.+',
-            re.DOTALL
-        )
-        self.assertRegex(
-            output,
-            out_re
-        )
+        with self.subTest(arguments=['-h']):
+            # Charlotte tries the regular help option -h, and sees some help
+            # text describing options
+            output = get_windows_output(['-h'])
+            position = 0
+            for excerpt in _HELP_EXCERPTS:
+                self.assertIn(excerpt, output[position:])
+                position = output.index(excerpt, position) + len(excerpt)
 
-        """
-        Charlotte tries some output filtering options
-        """
-        output = get_windows_output(
-            ['-pp', 'LrSt', '-dp', 'PShta', '-lp', 'VMn']
-        )
-        out_re = re.compile(
-            r'^System -- Name: [\S ]*, Type: [\S ]*, Version: [\S ]*\n.*'
-            r'Physical Disk -- Size: \d+, Heads: \d+, Media: [\S ]*'
-            r', Status: [\S ]*\n.*'
-            r'Partition -- Primary: (True|False), Size: \d+, Type: [\S ]*\n.*'
-            r'Logical Disk -- Label: [\S ]*, Mounted: [\S ]*,'
-            r' Serial: [\S ]*\n$',
-            re.DOTALL
-        )
-        self.assertRegex(
-            output,
-            out_re
-        )
+        with self.subTest(
+            arguments=['-pp', 'LrSt', '-dp', 'PShta', '-lp', 'VMn']
+        ):
+            # Charlotte tries some output filtering options
+            output = get_windows_output(
+                ['-pp', 'LrSt', '-dp', 'PShta', '-lp', 'VMn']
+            )
+            self.assertRegex(output, _FILTER_OUT_RE)
 
-        """
-        Charlotte tries the -l option and can see that the output is reversed
-        """
-        output = get_windows_output(['-l'])
-        out_re = re.compile(
-            r'^System -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n'
-            r'      Physical Disk -- [\S ]+?\n$'
-        )
-        self.assertRegex(output, out_re)
+        with self.subTest(arguments=['-l']):
+            # Charlotte tries the -l option and can see that the output is
+            # reversed
+            output = get_windows_output(['-l'])
+            self.assertRegex(output, _L_OUT_RE)
 
-        """
-        Charlotte tries the -p option and can see that the output skips the
-        physical disks
-        """
-        output = get_windows_output(['-p'])
-        out_re = re.compile(
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'    Logical Disk -- [\S ]+?\n$'
-        )
-        self.assertRegex(output, out_re)
+        with self.subTest(arguments=['-p']):
+            # Charlotte tries the -p option and can see that the output skips
+            # the physical disks
+            output = get_windows_output(['-p'])
+            self.assertRegex(output, _P_OUT_RE)
 
-        """
-        Charlotte tries the -l and -p option at the same time, and can see
-        that the output starts with partition and is reveresed
-        """
-        output = get_windows_output(['-p', '-l'])
-        out_re = re.compile(
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n'
-            r'    Physical Disk -- [\S ]+?\n$'
-        )
-        self.assertRegex(output, out_re)
+        with self.subTest(arguments=['-p', '-l']):
+            # Charlotte tries the -l and -p option at the same time, and can
+            # see that the output starts with partition and is reveresed
+            output = get_windows_output(['-p', '-l'])
+            self.assertRegex(output, _P_L_OUT_RE)
 
-        """
-        Charlotte tries the -dp option without P, and can see that only the
-        physical disks are displayd
-        """
-        output = get_windows_output(['-dp', 'ms'])
-        self.assertRegex(
-            output,
-            r'^System -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n$'
-        )
+        with self.subTest(arguments=['-dp', 'ms']):
+            # Charlotte tries the -dp option without P, and can see that only
+            # the physical disks are displayd
+            output = get_windows_output(['-dp', 'ms'])
+            self.assertRegex(output, _DISKS_ONLY_OUT_RE)
 
-        """
-        Charlotte tries the -pp option without L, and can see that only the
-        physical disks and their partitions are displayd
-        """
-        output = get_windows_output(['-pp', 'Ns'])
-        self.assertRegex(
-            output,
-            r'^System -- [\S ]+?\n'
-            r'  Physical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n$'
-        )
+        with self.subTest(arguments=['-pp', 'Ns']):
+            # Charlotte tries the -pp option without L, and can see that only
+            # the physical disks and their partitions are displayd
+            output = get_windows_output(['-pp', 'Ns'])
+            self.assertRegex(output, _NO_LOGICAL_DISKS_OUT_RE)
 
-        """
-        Charlotte tries the -p and -pp option without L, and can see that
-        only the partitions are displayd
-        """
-        output = get_windows_output(['-pp', 'Ns', '-p'])
-        self.assertRegex(
-            output,
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n$'
-        )
+        with self.subTest(arguments=['-pp', 'Ns', '-p']):
+            # Charlotte tries the -p and -pp option without L, and can see that
+            # only the partitions are displayd
+            output = get_windows_output(['-pp', 'Ns', '-p'])
+            self.assertRegex(output, _PARTITIONS_ONLY_OUT_RE)
 
-        """
-        Charlotte types the wrong option -X and gets a message that the
-        option is unrecognized
-        """
-        self.assertRaisesRegex(AssertionError, r'.+\npydiskinfo: error: unrecognized arguments: -X\n', get_windows_output, ['-X'])
+        with self.subTest(arguments=['-X']):
+            # Charlotte types the wrong option -X and gets a message that the
+            # option is unrecognized
+            self.assertRaisesRegex(
+                AssertionError,
+                r'.+\npydiskinfo: error: unrecognized arguments: -X\n',
+                get_windows_output,
+                ['-X']
+            )
 
-        """
-        Charlotte tries the -l and -pp option without D, and can see that
-        only the logical disks and their partitions are displayd
-        """
-        output = get_windows_output(['-pp', 'Ns', '-l'])
-        self.assertRegex(
-            output,
-            r'^System -- [\S ]+?\n'
-            r'  Logical Disk -- [\S ]+?\n'
-            r'    Partition -- [\S ]+?\n$'
-        )
+        with self.subTest(arguments=['-pp', 'Ns', '-l']):
+            # Charlotte tries the -l and -pp option without D, and can see that
+            # only the logical disks and their partitions are displayd
+            output = get_windows_output(['-pp', 'Ns', '-l'])
+            self.assertRegex(output, _NO_PHYSICAL_DISKS_OUT_RE)
 
-        """
-        Charlotte tries the -l, -p and -pp option without D, and can see that
-        only the partitions are displayd
-        """
-        output = get_windows_output(['-pp', 'Ns', '-l', '-p'])
-        self.assertRegex(
-            output,
-            r'^System -- [\S ]+?\n'
-            r'  Partition -- [\S ]+?\n$'
-        )
+        with self.subTest(arguments=['-pp', 'Ns', '-l', '-p']):
+            # Charlotte tries the -l, -p and -pp option without D, and can see
+            # that only the partitions are displayd
+            output = get_windows_output(['-pp', 'Ns', '-l', '-p'])
+            self.assertRegex(output, _PARTITIONS_ONLY_OUT_RE)
@@ -1,53 +1,170 @@
 import platform
+import re
 import wmi
-from system import System, LogicalDisk, PhysicalDisk, Partition
+from system import (
+    System,
+    SystemComponent,
+    LogicalDisk,
+    PhysicalDisk,
+    Partition
+)
 from exceptions import PyDiskInfoParseError
 
 
+_VERSION = f'{platform.win32_edition()} {platform.win32_ver()[1]}'
+_DISK_QUERY = (
+    'SELECT Size, Index, DeviceID, MediaType, SerialNumber, Model, '
+    'TotalSectors, TotalHeads, TotalCylinders, BytesPerSector, '
+    'FirmwareRevision, InterfaceType, MediaLoaded, Status '
+    'FROM Win32_DiskDrive'
+)
+_PARTITION_QUERY = (
+    'SELECT BlockSize, Bootable, BootPartition, Description, DeviceID, '
+    'DiskIndex, Index, NumberOfBlocks, PrimaryPartition, Size, '
+    'StartingOffset, Type FROM Win32_DiskPartition'
+)
+_LOGICAL_DISK_QUERY = (
+    'SELECT Description, DeviceID, DriveType, FileSystem, FreeSpace, '
+    'MaximumComponentLength, Size, VolumeName, VolumeSerialNumber '
+    'FROM Win32_LogicalDisk'
+)
+_LOGICAL_DISK_TO_PARTITION_QUERY = (
+    'SELECT Antecedent, Dependent FROM Win32_LogicalDiskToPartition'
+)
+_DRIVETYPES = (
+    'Unknown',
+    'No Root Directory',
+    'Removable Disk',
+    'Local Disk',
+    'Network Drive',
+    'Compact Disk',
+    'RAM Disk'
+)
+_REFERENCE_KEY = re.compile(r'="((?:[^"\\]|\\.)*)"$')
+_ESCAPED_CHARACTER = re.compile(r'\\(.)')
+
+
+def _get_reference_key(reference: str) -> str:
+    """Return the key value from a WMI object path with a single key, like
+    \\\\HOST\\root\\cimv2:Win32_LogicalDisk.DeviceID="C:"
+    """
+    match = _REFERENCE_KEY.search(reference)
+    if not match:
+        return ''
+    return _ESCAPED_CHARACTER.sub(r'\1', match.group(1))
+
+
+def _string(value: object) -> str:
+    """Return the value if it is a string, otherwise raise TypeError"""
+    if not isinstance(value, str):
+        raise TypeError(f'{value!r} is not a string')
+    return value
+
+
+def _query_rows(cursor: wmi._wmi_namespace, wql: str) -> list[dict]:
+    """Run a WQL query and return each instance as a dict of its properties.
+
+    This relies on _raw_query, a private method of the wmi package, which runs
+    ExecQuery with the forward only and return immediately flags. The raw
+    query skips the wmi object wrappers, so every property is read from COM
+    once, and references are kept as object path strings."""
+    return [
+        {
+            each_property.Name: each_property.Value
+            for each_property in each_instance.Properties_
+        }
+        for each_instance in cursor._raw_query(wql)
+    ]
+
+
+def _set_fields(component: SystemComponent, row: dict, fields: tuple) -> None:
+    """Copy WMI properties to a system component.
+
+    Each field is a tuple of WMI property name, component key, converter and
+    default. The default is used if the property is missing, null or can not
+    be converted. A converter of None copies the value as it is."""
+    set_item = component.__setitem__
+    get_value = row.get
+    for wmi_name, key, converter, default in fields:
+        value = get_value(wmi_name)
+        if value is None:
+            set_item(key, default)
+        elif converter is None:
+            set_item(key, value)
+        else:
+            try:
+                set_item(key, converter(value))
+            except (TypeError, ValueError):
+                set_item(key, default)
+
+
 class WindowsSystem(System):
     """This is the win32 version of the System class.
 
     This class will take care of the special cases when the module is runnning
     on windows."""
+    __slots__ = ()
 
-    def __init__(self, name: str = None) -> None:
-        super().__init__(name)
+    def __init__(
+        self,
+        name: str = None,
+        physical_disks_only: bool = False
+    ) -> None:
+        super().__init__(name, physical_disks_only)
         self._set_version()
         self['Type'] = 'Windows'
 
-    def _set_version(self):
-        self['Version'] = (
-            f'{platform.win32_edition()} {platform.win32_ver()[1]}'
-        )
+    def _set_version(self) -> None:
+        self['Version'] = _VERSION
+
+    def _add_partitions(
+        self,
+        cursor: wmi._wmi_namespace,
+        disks: dict
+    ) -> dict[str, Partition]:
+        """Add the partitions on the disks, which are keyed by WMI index.
+
+        Return the added partitions keyed by their WMI device id."""
+        partitions = {}
+        for each_partition in _query_rows(cursor, _PARTITION_QUERY):
+            disk = disks.get(each_partition['DiskIndex'])
+            if disk is None:
+                continue
+            partition = self._add_partition(
+                WindowsPartition(each_partition, disk)
+            )
+            disk.add_partition(partition)
+            partitions[each_partition['DeviceID']] = partition
+        return partitions
 
     def _add_logical_disks(
         self,
-        wmi_partition: wmi._wmi_object,
-        partition: Partition
+        cursor: wmi._wmi_namespace,
+        partitions: dict[str, Partition]
     ) -> None:
-        for each_logical_disk in wmi_partition.associators(
-            'Win32_LogicalDiskToPartition'
+        """Add the logical disks on the given partitions"""
+        wmi_logical_disks = {
+            each_logical_disk['DeviceID']: each_logical_disk
+            for each_logical_disk in _query_rows(cursor, _LOGICAL_DISK_QUERY)
+        }
+        for each_link in _query_rows(
+            cursor,
+            _LOGICAL_DISK_TO_PARTITION_QUERY
         ):
+            partition = partitions.get(
+                _get_reference_key(each_link['Antecedent'])
+            )
+            wmi_logical_disk = wmi_logical_disks.get(
+                _get_reference_key(each_link['Dependent'])
+            )
+            if partition is None or wmi_logical_disk is None:
+                continue
             logical_disk = self._add_logical_disk(
-                WindowsLogicalDisk(each_logical_disk, self)
+                WindowsLogicalDisk(wmi_logical_disk, self)
             )
             logical_disk.add_partition(partition)
             partition.add_logical_disk(logical_disk)
 
-    def _add_partitions(
-        self,
-        wmi_disk: wmi._wmi_object,
-        disk: PhysicalDisk
-    ) -> None:
-        for each_partition in wmi_disk.associators(
-            'Win32_DiskDriveToDiskPartition'
-        ):
-            partition = self._add_partition(
-                WindowsPartition(each_partition, disk)
-            )
-            disk.add_partition(partition)
-            self._add_logical_disks(each_partition, partition)
-
     def _parse_system(self) -> None:
         """Parse the system"""
         try:
@@ -58,383 +175,113 @@ class WindowsSystem(System):
             raise PyDiskInfoParseError(
                 'Authentication error when opening wmi'
             ) from err
-        for each_disk in cursor.Win32_DiskDrive():
+        disks = {}
+        for each_disk in _query_rows(cursor, _DISK_QUERY):
             disk = WindowsPhysicalDisk(each_disk, self)
             self._physical_disks.append(disk)
-            self._add_partitions(each_disk, disk)
+            disks[each_disk['Index']] = disk
+        if self._physical_disks_only:
+            return
+        self._add_logical_disks(
+            cursor,
+            self._add_partitions(cursor, disks)
+        )
 
 
 class WindowsPhysicalDisk(PhysicalDisk):
     """Subclass of PhysicalDrive that handles special windows situations"""
-    def __init__(self, wmi_physical_disk: object, system: object) -> None:
+    __slots__ = ()
+    _FIELDS = (
+        ('Size', 'Size', int, -1),
+        ('Index', 'Disk Number', int, -1),
+        ('DeviceID', 'Path', None, ''),
+        ('DeviceID', 'Device I.D.', None, ''),
+        ('MediaType', 'Media', None, ''),
+        ('SerialNumber', 'Serial', None, ''),
+        ('Model', 'Model', None, ''),
+        ('TotalSectors', 'Sectors', int, -1),
+        ('TotalHeads', 'Heads', int, -1),
+        ('TotalCylinders', 'Cylinders', int, -1),
+        ('BytesPerSector', 'Bytes per Sector', int, -1),
+        ('FirmwareRevision', 'Firmware', None, 'Unspecified'),
+        ('InterfaceType', 'Interface', None, ''),
+        ('MediaLoaded', 'Media Loaded', None, False),
+        ('Status', 'Status', None, '')
+    )
+
+    def __init__(self, wmi_physical_disk: dict, system: object) -> None:
         super().__init__(system)
-        self._set_size(wmi_physical_disk)
-        self._set_disk_number(wmi_physical_disk)
-        self._set_device_id_and_path(wmi_physical_disk)
-        self._set_media_type(wmi_physical_disk)
-        self._set_serial_number(wmi_physical_disk)
-        self._set_model(wmi_physical_disk)
-        self._set_sectors(wmi_physical_disk)
-        self._set_heads(wmi_physical_disk)
-        self._set_cylinders(wmi_physical_disk)
-        self._set_bytes_per_sector(wmi_physical_disk)
-        self._set_firmware(wmi_physical_disk)
-        self._set_interface_type(wmi_physical_disk)
-        self._set_media_loaded(wmi_physical_disk)
-        self._set_status(wmi_physical_disk)
-
-    def _set_size(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        """set size of disk in bytes."""
-        try:
-            self['Size'] = int(wmi_physical_disk.Size)
-        except ValueError:
-            self['Size'] = -1
-
-    def _set_disk_number(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        """set system disk identification number"""
-        try:
-            self['Disk Number'] = int(wmi_physical_disk.Index)
-        except ValueError:
-            self['Disk Number'] = -1
-
-    def _set_device_id_and_path(
-        self,
-        wmi_physical_disk: wmi._wmi_object
-    ) -> None:
-        try:
-            self['Path'] = wmi_physical_disk.DeviceID
-            self['Device I.D.'] = self['Path']
-        except AttributeError:
-            self['Path'] = ""
-            self['Device I.D.'] = ""
-
-    def _set_media_type(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        try:
-            self['Media'] = wmi_physical_disk.MediaType
-        except AttributeError:
-            self['Media'] = ""
-
-    def _set_serial_number(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        try:
-            self['Serial'] = wmi_physical_disk.SerialNumber
-        except AttributeError:
-            self['Serial'] = ""
-
-    def _set_model(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        try:
-            self['Model'] = wmi_physical_disk.Model
-        except AttributeError:
-            self['Model'] = ""
-
-    def _set_sectors(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        """Set total number of sectors, or -1 if not a number."""
-        try:
-            self['Sectors'] = int(wmi_physical_disk.TotalSectors)
-        except ValueError:
-            self['Sectors'] = -1
-
-    def _set_heads(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        """Set total number of heads, or -1 if not a number"""
-        try:
-            self['Heads'] = int(wmi_physical_disk.TotalHeads)
-        except ValueError:
-            self['Heads'] = -1
-
-    def _set_cylinders(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        """Set total number of cylinders, or -1 if not a number"""
-        try:
-            self['Cylinders'] = int(wmi_physical_disk.TotalCylinders)
-        except ValueError:
-            self['Cylinders'] = -1
-
-    def _set_bytes_per_sector(
-        self,
-        wmi_physical_disk: wmi._wmi_object
-    ) -> None:
-        """Set bytes per sector, or -1 if not a number"""
-        try:
-            self['Bytes per Sector'] = int(wmi_physical_disk.BytesPerSector)
-        except ValueError:
-            self['Bytes per Sector'] = -1
-
-    def _set_firmware(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        """Set firmware"""
-        try:
-            self['Firmware'] = wmi_physical_disk.FirmWare
-        except AttributeError:
-            self['Firmware'] = "Unspecified"
-
-    def _set_interface_type(
-        self,
-        wmi_physical_disk: wmi._wmi_object
-    ) -> None:
-        try:
-            self['Interface'] = wmi_physical_disk.InterfaceType
-        except AttributeError:
-            self['Interface'] = ""
-
-    def _set_media_loaded(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        try:
-            self['Media Loaded'] = wmi_physical_disk.MediaLoaded
-        except AttributeError:
-            self['Media Loaded'] = False
-
-    def _set_status(self, wmi_physical_disk: wmi._wmi_object) -> None:
-        try:
-            self['Status'] = wmi_physical_disk.Status
-        except AttributeError:
-            self['Status'] = ""
+        _set_fields(self, wmi_physical_disk, self._FIELDS)
 
 
 class WindowsPartition(Partition):
+    __slots__ = ()
+    _FIELDS = (
+        ('BlockSize', 'Blocksize', int, -1),
+        ('Bootable', 'Bootable', None, False),
+        ('BootPartition', 'Active', None, False),
+        ('Description', 'Description', None, ''),
+        ('DeviceID', 'Device I.D.', None, ''),
+        ('DiskIndex', 'Disk Number', int, -1),
+        ('Index', 'Partition Number', int, -1),
+        ('NumberOfBlocks', 'Blocks', int, -1),
+        ('PrimaryPartition', 'Primary', None, False),
+        ('Size', 'Size', int, 0),
+        ('StartingOffset', 'Offset', int, -1),
+        ('Type', 'Type', None, '')
+    )
+
     def __init__(
         self,
-        partition: wmi._wmi_object,
+        partition: dict,
         disk: PhysicalDisk
     ) -> None:
         super().__init__(disk)
-        self._wmi_partition = partition
-        self._set_blocksize(partition)
-        self._set_bootable(partition)
-        self._set_active(partition)
-        self._set_description(partition)
-        self._set_device_id(partition)
-        self._set_disk_number(partition)
-        self._set_partition_number(partition)
-        self._set_number_of_blocks(partition)
-        self['Primary'] = self._get_primary_partition()
-        self._set_size(partition)
-        self._set_starting_offset(partition)
-        self._set_type(partition)
-
-    def _set_blocksize(self, partition: wmi._wmi_object) -> None:
-        """Set blocksize or -1 if it fails."""
-        try:
-            self['Blocksize'] = int(partition.BlockSize)
-        except AttributeError:
-            self['Blocksize'] = -1
-        except ValueError:
-            self['Blocksize'] = -1
-
-    def _set_bootable(self, partition: wmi._wmi_object) -> None:
-        """Set bootable or false if it fails."""
-        try:
-            self['Bootable'] = partition.Bootable
-        except AttributeError:
-            self['Bootable'] = False
-
-    def _set_active(self, partition: wmi._wmi_object) -> None:
-        """Set if system boot partition, or False if it fails."""
-        try:
-            self['Active'] = partition.BootPartition
-        except AttributeError:
-            self['Active'] = False
-
-    def _set_description(self, partition: wmi._wmi_object) -> None:
-        """set a description provided by the system."""
-        try:
-            self['Description'] = partition.Description
-        except AttributeError:
-            self['Description'] = ""
-
-    def _set_device_id(self, partition: wmi._wmi_object) -> None:
-        """set the device id provided by the system."""
-        try:
-            self['Device I.D.'] = partition.DeviceID
-        except AttributeError:
-            self['Device I.D.'] = ""
-
-    def _set_disk_number(self, partition: wmi._wmi_object) -> None:
-        """Set the disk index number as the system sees it."""
-        try:
-            self['Disk Number'] = int(partition.DiskIndex)
-        except AttributeError:
-            self['Disk Number'] = -1
-        except ValueError:
-            self['Disk Number'] = -1
-
-    def _set_partition_number(self, partition: wmi._wmi_object) -> None:
-        """Set the partition index on the disk, according to the system."""
-        try:
-            self['Partition Number'] = int(partition.Index)
-        except AttributeError:
-            self['Partition Number'] = -1
-        except ValueError:
-            self['Partition Number'] = -1
-
-    def _set_number_of_blocks(self, partition: wmi._wmi_object) -> None:
-        """Set number of blocks."""
-        try:
-            self['Blocks'] = int(partition.NumberOfBlocks)
-        except AttributeError:
-            self['Blocks'] = -1
-        except ValueError:
-            self['Blocks'] = -1
-
-    def _get_primary_partition(self) -> None:
-        """Set if the partition is a primary partition"""
-        try:
-            primary = self._wmi_partition.PrimaryPartition
-        except AttributeError:
-            primary = False
-        return primary
-
-    def _set_size(self, partition: wmi._wmi_object) -> None:
-        """Set partition size in bytes."""
-        try:
-            self['Size'] = int(partition.Size)
-        except AttributeError:
-            self['Size'] = 0
-        except ValueError:
-            self['Size'] = 0
-
-    def _set_starting_offset(self, partition: wmi._wmi_object) -> None:
-        """Set partition starting offset in bytes."""
-        try:
-            self['Offset'] = int(partition.StartingOffset)
-        except AttributeError:
-            self['Offset'] = -1
-        except ValueError:
-            self['Offset'] = -1
-
-    def _set_type(self, partition: wmi._wmi_object) -> None:
-        """Set partition type."""
-        try:
-            self['Type'] = partition.Type
-        except AttributeError:
-            self['Type'] = ""
+        _set_fields(self, partition, self._FIELDS)
 
 
 class WindowsLogicalDisk(LogicalDisk):
-    _DRIVETYPES = [
-        'Unknown',
-        'No Root Directory',
-        'Removable Disk',
-        'Local Disk',
-        'Network Drive',
-        'Compact Disk',
-        'RAM Disk'
-    ]
+    __slots__ = ('_wmi_logical_disk',)
+    _FIELDS = (
+        ('Description', 'Description', _string, ''),
+        ('FileSystem', 'Filesystem', _string, 'unknown'),
+        ('FreeSpace', 'Free Space', int, 0),
+        ('MaximumComponentLength', 'Max Component Length', int, 0),
+        ('Size', 'Size', int, 0),
+        ('VolumeName', 'Label', _string, ''),
+        ('VolumeSerialNumber', 'Serial', _string, '')
+    )
 
     def __init__(
         self,
-        logical_disk: wmi._wmi_object,
+        logical_disk: dict,
         system: System
     ) -> None:
         super().__init__(system)
         self._wmi_logical_disk = logical_disk
-        self._set_description(logical_disk)
         self['Device I.D.'], self['Name'], self['Mounted'] = (
             self._get_device_id_name_mounted()
         )
         self._set_drive_type(logical_disk)
-        self._set_file_system(logical_disk)
-        self._set_free_space(logical_disk)
-        self._set_maximum_component_length(logical_disk)
-        self._set_size(logical_disk)
-        self._set_volume_name(logical_disk)
-        self._set_volume_serial_number(logical_disk)
-
-    def _set_description(self, logical_disk: wmi._wmi_object) -> None:
-        """Set the description"""
-        try:
-            self['Description'] = logical_disk.Description
-            if not type(self['Description']) == str:
-                self['Description'] = ""
-        except AttributeError:
-            self['Description'] = ""
-
-    def _get_device_id_name_mounted(self) -> None:
-        """Set the unique device ID and name. On windows
+        _set_fields(self, logical_disk, self._FIELDS)
+
+    def _get_device_id_name_mounted(self) -> tuple[str, str, str]:
+        """Return the unique device ID, name and mount point. On windows
         this is pretty much the same as path.
         """
-        try:
-            device_id = self._wmi_logical_disk.DeviceID
-            if not type(device_id) == str:
-                device_id = ''
-        except AttributeError:
+        device_id = self._wmi_logical_disk.get('DeviceID')
+        if not isinstance(device_id, str):
             device_id = ''
         name = device_id
         mounted = device_id + '\\'
         return device_id, name, mounted
 
-    def _set_drive_type(self, logical_disk: wmi._wmi_object) -> None:
+    def _set_drive_type(self, logical_disk: dict) -> None:
         """Set the drive type."""
         try:
-            drivetype = int(logical_disk.DriveType)
-        except AttributeError:
+            drivetype = int(logical_disk.get('DriveType'))
+        except (TypeError, ValueError):
             drivetype = 0
-        except ValueError:
+        if not 0 <= drivetype < len(_DRIVETYPES):
             drivetype = 0
-        try:
-            self['Type'] = self._DRIVETYPES[drivetype]
-        except IndexError:
-            self['Type'] = self._DRIVETYPES[0]
-
-    def _set_file_system(self, logical_disk: wmi._wmi_object) -> None:
-        """Set the filesystem according to the system."""
-        try:
-            self['Filesystem'] = logical_disk.FileSystem
-            if type(self['Filesystem']) != str:
-                self['Filesystem'] = "unknown"
-        except AttributeError:
-            self['Filesystem'] = "unknown"
-
-    def _set_free_space(self, logical_disk: wmi._wmi_object) -> None:
-        """Set the available space on the filesystem in bytes"""
-        try:
-            self['Free Space'] = int(logical_disk.FreeSpace)
-        except AttributeError:
-            self['Free Space'] = 0
-        except ValueError:
-            self['Free Space'] = 0
-        except TypeError:
-            self['Free Space'] = 0
-
-    def _set_maximum_component_length(
-        self,
-        logical_disk: wmi._wmi_object
-    ) -> None:
-        """Set the max path length in characters."""
-        try:
-            self['Max Component Length'] = int(
-                logical_disk.MaximumComponentLength
-            )
-        except AttributeError:
-            self['Max Component Length'] = 0
-        except ValueError:
-            self['Max Component Length'] = 0
-        except TypeError:
-            self['Max Component Length'] = 0
-
-    def _set_size(self, logical_disk: wmi._wmi_object) -> None:
-        """Set the size in bytes."""
-        try:
-            self['Size'] = int(logical_disk.Size)
-        except AttributeError:
-            self['Size'] = 0
-        except ValueError:
-            self['Size'] = 0
-        except TypeError:
-            self['Size'] = 0
-
-    def _set_volume_name(self, logical_disk: wmi._wmi_object) -> None:
-        """Set the volume name. Usually the Label value."""
-        try:
-            self['Label'] = logical_disk.VolumeName
-            if type(self['Label']) != str:
-                self['Label'] = ""
-        except AttributeError:
-            self['Label'] = ""
-
-    def _set_volume_serial_number(
-        self,
-        logical_disk: wmi._wmi_object
-    ) -> None:
-        """Set the volume serial number."""
-        try:
-            self['Serial'] = logical_disk.VolumeSerialNumber
-            if type(self['Serial']) != str:
-                self['Serial'] = ""
-        except AttributeError:
-            self['Serial'] = ""
+        self['Type'] = _DRIVETYPES[drivetype]